@@ -5,14 +5,55 @@ This module defines the primary entities in the freelancer-client ecosystem:
 freelancers, clients, contracts, and transactions.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, date
-from enum import Enum
-from typing import Dict, List, Optional, Any
-from decimal import Decimal
+from enum import Enum, IntEnum, auto
+from typing import Dict, List, Optional, Any, Callable, Union
+from decimal import Decimal, ROUND_HALF_UP
 import uuid
 
 
+def to_cents(amount: Union[Decimal, int, float]) -> int:
+    """Convert a currency amount to integer cents, rounding half up."""
+    if not isinstance(amount, Decimal):
+        # str() keeps floats at their shortest repr, so 5.005 stays 5.005
+        amount = Decimal(str(amount))
+    return int(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents back to a currency amount."""
+    return Decimal(int(cents)).scaleb(-2)
+
+
+class _Observed:
+    """
+    Base for entities whose fields the simulation engine mirrors.
+    
+    Assigning to a field named in ``_observed_fields`` calls the attached
+    observer as ``observer(entity, field_name)``, so the engine updates its
+    derived state on writes instead of rescanning every entity.
+    """
+    
+    __slots__ = ('_observer',)
+    _observed_fields = frozenset()
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in self._observed_fields:
+            observer = getattr(self, '_observer', None)
+            if observer is not None:
+                observer(self, name)
+    
+    def attach_observer(self, observer: Optional[Callable[[Any, str], None]]) -> None:
+        """Set or clear the callback notified of writes to observed fields."""
+        object.__setattr__(self, '_observer', observer)
+    
+    def __getstate__(self):
+        # Pickles and copies carry the fields only, never the observer
+        return None, {f.name: getattr(self, f.name) for f in fields(self)}
+
+
 class FreelancerType(Enum):
     """Types of freelancers based on work characteristics."""
     INDEPENDENT_CONTRACTOR = "independent_contractor"
@@ -32,14 +73,26 @@ class ClientType(Enum):
     GOVERNMENT = "government"
 
 
-class ContractStatus(Enum):
+class ContractStatus(IntEnum):
     """Contract lifecycle states."""
-    DRAFT = "draft"
-    NEGOTIATING = "negotiating"
-    ACTIVE = "active"
-    COMPLETED = "completed"
-    TERMINATED = "terminated"
-    DISPUTED = "disputed"
+    DRAFT = auto()
+    NEGOTIATING = auto()
+    ACTIVE = auto()
+    COMPLETED = auto()
+    TERMINATED = auto()
+    DISPUTED = auto()
+    
+    @property
+    def label(self) -> str:
+        """String form used for serialization, e.g. ``"active"``."""
+        return self.name.lower()
+    
+    @classmethod
+    def _missing_(cls, value):
+        # Accept the string labels used by serialized data
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
 
 
 class ComplianceStatus(Enum):
@@ -50,10 +103,16 @@ class ComplianceStatus(Enum):
     DISPUTED = "disputed"
 
 
-@dataclass
-class Freelancer:
+@dataclass(slots=True)
+class Freelancer(_Observed):
     """Represents a freelancer in the ecosystem."""
     
+    _observed_fields = frozenset({
+        'hourly_rate', 'risk_tolerance', 'administrative_capacity',
+        'negotiation_skill', 'market_knowledge', 'experience_years',
+        'primary_client_dependency',
+    })
+    
     id: str
     name: str
     freelancer_type: FreelancerType
@@ -82,7 +141,7 @@ class Freelancer:
             self.id = str(uuid.uuid4())
 
 
-@dataclass
+@dataclass(slots=True)
 class Client:
     """Represents a client in the ecosystem."""
     
@@ -113,10 +172,12 @@ class Client:
             self.id = str(uuid.uuid4())
 
 
-@dataclass
-class Contract:
+@dataclass(slots=True)
+class Contract(_Observed):
     """Represents a contract between a freelancer and client."""
     
+    _observed_fields = frozenset({'status', 'sb988_compliant', 'end_date'})
+    
     id: str
     freelancer_id: str
     client_id: str
@@ -161,7 +222,7 @@ class Contract:
             self.compliance_requirements = []
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     """Represents a financial transaction in the ecosystem."""
     
@@ -186,9 +247,14 @@ class Transaction:
     def __post_init__(self):
         if not self.id:
             self.id = str(uuid.uuid4())
+    
+    @property
+    def amount_cents(self) -> int:
+        """Transaction amount as integer cents."""
+        return to_cents(self.amount)
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketSnapshot:
     """Represents the state of the market at a point in time."""
     
@@ -0,0 +1,105 @@
+"""
+Columnar market history for the SB 988 compliance simulator.
+
+This module stores per-step market indicators as parallel NumPy columns and
+materializes MarketSnapshot objects only when they are requested.
+"""
+
+from collections.abc import Sequence
+from dataclasses import MISSING, fields
+from datetime import datetime
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from .entities import MarketSnapshot, to_cents, from_cents
+
+
+# Column dtypes for the numeric MarketSnapshot fields. Transaction volume is
+# stored in integer cents.
+SNAPSHOT_COLUMNS = {
+    'total_freelancers': np.int64,
+    'total_clients': np.int64,
+    'active_contracts': np.int64,
+    'total_transaction_volume': np.int64,
+    'average_hourly_rate': np.float64,
+    'compliance_rate': np.float64,
+    'market_demand': np.float64,
+    'regulatory_pressure': np.float64,
+    'economic_uncertainty': np.float64,
+}
+
+_SNAPSHOT_DEFAULTS = {
+    f.name: f.default for f in fields(MarketSnapshot) if f.default is not MISSING
+}
+
+
+class MarketHistory(Sequence):
+    """
+    Append-only sequence of market snapshots stored column-wise.
+
+    Indexing returns a freshly built MarketSnapshot; use ``column`` to read
+    an indicator across all steps without materializing snapshots.
+    ``append`` takes a MarketSnapshot like the list this replaces, while
+    ``record`` stores raw indicator values without building one.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._timestamps: List[datetime] = []
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in SNAPSHOT_COLUMNS.items()
+        }
+        self._size = 0
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[MarketSnapshot]) -> 'MarketHistory':
+        """Build a history from existing MarketSnapshot objects."""
+        history = cls()
+        for snapshot in snapshots:
+            history.append(snapshot)
+        return history
+
+    def record(self, timestamp: datetime, **values) -> None:
+        """
+        Record one step's market indicators.
+
+        ``values`` are keyed by MarketSnapshot field name, with
+        ``total_transaction_volume`` given in cents. Fields with a default on
+        MarketSnapshot may be omitted.
+        """
+        n = self._size
+        if n == len(self._columns['compliance_rate']):
+            for name, column in self._columns.items():
+                self._columns[name] = np.resize(column, 2 * n)
+
+        for name, column in self._columns.items():
+            column[n] = values[name] if name in values else _SNAPSHOT_DEFAULTS[name]
+        self._timestamps.append(timestamp)
+        self._size = n + 1
+
+    def append(self, snapshot: MarketSnapshot) -> None:
+        """Add a MarketSnapshot, storing its transaction volume in cents."""
+        values = {name: getattr(snapshot, name) for name in SNAPSHOT_COLUMNS}
+        values['total_transaction_volume'] = to_cents(snapshot.total_transaction_volume)
+        self.record(snapshot.timestamp, **values)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a view of one indicator across all recorded steps."""
+        return self._columns[name][:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("market history index out of range")
+
+        values = {name: column[index].item() for name, column in self._columns.items()}
+        values['total_transaction_volume'] = from_cents(values['total_transaction_volume'])
+        return MarketSnapshot(timestamp=self._timestamps[index], **values)
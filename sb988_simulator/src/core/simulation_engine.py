@@ -5,17 +5,58 @@ This module provides the main simulation orchestration logic that coordinates
 all the different modeling components.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from collections import deque
+from datetime import datetime, timedelta, date
+from typing import Dict, List, Optional, Any, Callable, Tuple, Hashable, Iterable
+import heapq
+import inspect
+import itertools
 import logging
+import textwrap
 from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
 import numpy as np
 
-from .entities import Freelancer, Client, Contract, Transaction, MarketSnapshot
+from .entities import (
+    Freelancer, Client, Contract, Transaction, MarketSnapshot,
+    ContractStatus, ComplianceStatus, from_cents
+)
+from .market_history import MarketHistory
+from .transaction_store import TransactionStore
 from .scenario import Scenario
 from .metrics import MetricsCollector
 
 
+# Freelancer attributes mirrored into structure-of-arrays columns, in the
+# order behavior kernels receive them. Freelancer observes writes to each of
+# these attributes.
+FREELANCER_SOA_FIELDS = {
+    'risk': 'risk_tolerance',
+    'rate': 'hourly_rate',
+    'admin': 'administrative_capacity',
+    'negotiation': 'negotiation_skill',
+    'knowledge': 'market_knowledge',
+    'experience': 'experience_years',
+    'dependency': 'primary_client_dependency',
+}
+_SOA_COLUMN_BY_ATTRIBUTE = {attribute: column for column, attribute in FREELANCER_SOA_FIELDS.items()}
+
+
+def _accepts_keyword(fn: Callable, name: str) -> bool:
+    """Whether ``fn`` can be called with the keyword argument ``name``."""
+    try:
+        parameters = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        param.kind is param.VAR_KEYWORD or
+        (param.name == name and param.kind in (param.POSITIONAL_OR_KEYWORD,
+                                               param.KEYWORD_ONLY))
+        for param in parameters
+    )
+
+
 @dataclass
 class SimulationConfig:
     """Configuration for simulation runs."""
@@ -59,18 +100,99 @@ class SimulationEngine:
     and regulatory scenario testing to produce comprehensive simulation results.
     """
     
+    # Number of recent steps the convergence check looks at
+    CONVERGENCE_WINDOW = 10
+    
+    # Event priorities; lower values run first among events at the same time
+    STEP_PRIORITY = 0
+    
+    # Phases of one time step, in execution order
+    STEP_PHASES = (
+        '_update_market_conditions',
+        '_execute_agent_behaviors',
+        '_process_contracts',
+        '_apply_regulatory_scenarios',
+        '_collect_step_metrics',
+    )
+    
     def __init__(self, config: SimulationConfig):
         self.config = config
         self.current_time = config.start_date
         
-        # Core entities
-        self.freelancers: Dict[str, Freelancer] = {}
-        self.clients: Dict[str, Client] = {}
-        self.contracts: Dict[str, Contract] = {}
-        self.transactions: List[Transaction] = []
+        # Core entities. Populations are exposed read-only so additions and
+        # removals go through the mutators that keep derived state in sync.
+        self._freelancers: Dict[str, Freelancer] = {}
+        self.freelancers = MappingProxyType(self._freelancers)
+        self._clients: Dict[str, Client] = {}
+        self.clients = MappingProxyType(self._clients)
+        self._contracts: Dict[str, Contract] = {}
+        self.contracts = MappingProxyType(self._contracts)
+        self.transactions = TransactionStore()
+        
+        # Cached population sequences handed to behavioral models, reset by
+        # the population mutators
+        self._clients_view: Optional[Tuple[Client, ...]] = None
+        self._freelancers_view: Optional[Tuple[Freelancer, ...]] = None
+        
+        # Structure-of-arrays mirror of freelancer numeric fields. Writes to
+        # a freelancer's rate update its cell right away; the other columns
+        # are only read by the behavior kernel, so while none is installed
+        # writes to them just mark the columns stale.
+        capacity = max(config.initial_freelancers, 16)
+        self._fl_soa: Dict[str, np.ndarray] = {
+            column: np.empty(capacity, dtype=np.float64)
+            for column in FREELANCER_SOA_FIELDS
+        }
+        self._fl_actions = np.zeros(capacity, dtype=np.int64)
+        self._fl_draws = np.empty(capacity, dtype=np.float64)
+        self._n_freelancers = 0
+        self._freelancer_index: Dict[str, int] = {}
+        self._freelancer_ids: List[str] = []
+        self._fl_columns_stale = False
+        self._freelancer_observer = self._on_freelancer_change
+        
+        # Contract mirror columns, one row per contract. They hold the
+        # state the market counters were last updated from; status 0 marks a
+        # row with nothing counted yet. Contracts report writes to their
+        # status, compliance and end date through the observer, which keeps
+        # the rows and counters current without rescanning.
+        self._contract_index: Dict[str, int] = {}
+        self._contract_ids: List[str] = []
+        self._contract_status = np.zeros(256, dtype=np.int8)
+        self._compliant_bits = np.zeros(256 // 64, dtype=np.uint64)  # one bit per row
+        self._contract_end = np.zeros(256, dtype=np.int32)  # end-date ordinal, 0 if none
+        self._n_contracts = 0
+        self._contract_observer = self._on_contract_change
+        
+        # Market counters, updated on state transitions instead of rescanned
+        # every step
+        self._active_contract_count = 0
+        self._compliant_contract_count = 0
+        
+        # Compliance verdicts keyed by the compliance-relevant contract terms
+        # plus the scenario that produced them
+        self._compliance_cache: Dict[tuple, Tuple[ComplianceStatus, float]] = {}
+        
+        # Rolling compliance-rate window for the convergence check, with a
+        # running mean and sum of squared deviations (Welford)
+        self._conv_window: deque = deque(maxlen=self.CONVERGENCE_WINDOW)
+        self._conv_mean = 0.0
+        self._conv_m2 = 0.0
+        
+        # Discrete-event queue of (time, priority, seq, callback) entries
+        self._event_queue: List[Tuple[datetime, int, int, Callable[[], None]]] = []
+        self._event_seq = itertools.count()
+        self._iteration = 0
+        self._halted = False
+        
+        # Active contracts keyed by end-date ordinal, drained as they expire
+        self._expiry_heap: List[Tuple[int, str]] = []
+        
+        # Step specialized by run() to the injected models, if any
+        self._compiled_step: Optional[Callable[[], None]] = None
         
         # Simulation state
-        self.market_snapshots: List[MarketSnapshot] = []
+        self._market_history = MarketHistory()
         self.metrics_collector = MetricsCollector()
         self.scenarios: List[Scenario] = []
         
@@ -78,25 +200,228 @@ class SimulationEngine:
         self.freelancer_behavior_model: Optional[Callable] = None
         self.client_behavior_model: Optional[Callable] = None
         self.market_dynamics_model: Optional[Callable] = None
+        self.freelancer_kernel: Optional[Callable] = None
+        self.freelancer_action_handler: Optional[Callable] = None
+        
+        # Whether a callback accepts a given keyword, resolved once per
+        # callback instead of inspecting its signature every step
+        self._keyword_support: Dict[Tuple[Callable, str], bool] = {}
         
         # Set up logging
         self.logger = logging.getLogger(__name__)
         
-        # Initialize random number generator
-        if config.random_seed:
-            np.random.seed(config.random_seed)
+        # Initialize random number generators: one stream for behavioral
+        # models and an independent one for behavior-kernel draws
+        self._seed_sequence = np.random.SeedSequence(config.random_seed)
+        model_seed, kernel_seed = self._seed_sequence.spawn(2)
+        self.rng = np.random.default_rng(model_seed)
+        self._kernel_rng = np.random.default_rng(kernel_seed)
+    
+    @property
+    def market_snapshots(self) -> MarketHistory:
+        """Market snapshots recorded so far, one per time step."""
+        return self._market_history
+    
+    @market_snapshots.setter
+    def market_snapshots(self, snapshots: Iterable[MarketSnapshot]) -> None:
+        self._market_history = MarketHistory.from_snapshots(snapshots)
+        self._conv_window.clear()
+        self._conv_mean = 0.0
+        self._conv_m2 = 0.0
+        for rate in self._market_history.column('compliance_rate')[-self.CONVERGENCE_WINDOW:]:
+            self._update_convergence_window(float(rate))
+    
+    def spawn_rngs(self, n: int) -> List[np.random.Generator]:
+        """
+        Create independent random generators for parallel workers.
+        
+        Streams are derived from the engine's seed, so a seeded run stays
+        reproducible however the work is split.
+        """
+        return [np.random.default_rng(child) for child in self._seed_sequence.spawn(n)]
     
     def add_scenario(self, scenario: Scenario) -> None:
         """Add a regulatory scenario to test."""
         self.scenarios.append(scenario)
     
+    def add_freelancer(self, freelancer: Freelancer) -> None:
+        """Add a freelancer to the population."""
+        if freelancer.id in self._freelancers:
+            self.remove_freelancer(freelancer.id)
+        self._freelancers[freelancer.id] = freelancer
+        self._register_freelancer(freelancer)
+        freelancer.attach_observer(self._freelancer_observer)
+        self._freelancers_view = None
+    
+    def remove_freelancer(self, freelancer_id: str) -> Optional[Freelancer]:
+        """Remove a freelancer from the population."""
+        freelancer = self._freelancers.pop(freelancer_id, None)
+        if freelancer is not None:
+            freelancer.attach_observer(None)
+            self._unregister_freelancer(freelancer_id)
+            self._freelancers_view = None
+        return freelancer
+    
+    def add_client(self, client: Client) -> None:
+        """Add a client to the population."""
+        self._clients[client.id] = client
+        self._clients_view = None
+    
+    def remove_client(self, client_id: str) -> Optional[Client]:
+        """Remove a client from the population."""
+        client = self._clients.pop(client_id, None)
+        if client is not None:
+            self._clients_view = None
+        return client
+    
+    def set_freelancer_rate(self, freelancer_id: str, hourly_rate: Decimal) -> None:
+        """Change a freelancer's hourly rate."""
+        self._freelancers[freelancer_id].hourly_rate = hourly_rate
+    
+    def schedule(self, when: datetime, priority: int, fn: Callable[[], None]) -> None:
+        """
+        Schedule a callback to run at a given simulation time.
+        
+        Behavioral models and scenarios use this to request follow-up events
+        instead of polling every step. Events at the same time run in
+        priority order, then in the order they were scheduled.
+        """
+        heapq.heappush(self._event_queue, (when, priority, next(self._event_seq), fn))
+    
+    def add_contract(self, contract: Contract) -> None:
+        """
+        Add a contract to the simulation.
+        
+        The engine observes the contract from then on, so its status,
+        compliance and end date may be changed in place or through the
+        ``set_contract_*`` helpers.
+        """
+        idx = self._contract_row(contract.id)
+        previous = self._contracts.get(contract.id)
+        if previous is not None and previous is not contract:
+            previous.attach_observer(None)
+        self._contracts[contract.id] = contract
+        contract.attach_observer(self._contract_observer)
+        self._sync_contract_row(idx, contract)
+    
+    def remove_contract(self, contract_id: str) -> Optional[Contract]:
+        """Remove a contract from the simulation and stop observing it."""
+        contract = self._contracts.pop(contract_id, None)
+        if contract is None:
+            return None
+        contract.attach_observer(None)
+        
+        idx = self._contract_index.pop(contract_id)
+        if self._contract_status[idx] == ContractStatus.ACTIVE:
+            self._active_contract_count -= 1
+            self._expiry_heap = [entry for entry in self._expiry_heap
+                                 if entry[1] != contract_id]
+            heapq.heapify(self._expiry_heap)
+        if self._compliant_flag(idx):
+            self._compliant_contract_count -= 1
+        
+        # Fill the hole with the last mirror row
+        last = self._n_contracts - 1
+        if idx != last:
+            moved_id = self._contract_ids[last]
+            self._contract_status[idx] = self._contract_status[last]
+            self._set_compliant_flag(idx, self._compliant_flag(last))
+            self._contract_end[idx] = self._contract_end[last]
+            self._contract_ids[idx] = moved_id
+            self._contract_index[moved_id] = idx
+        self._set_compliant_flag(last, False)
+        self._contract_ids.pop()
+        self._n_contracts = last
+        return contract
+    
+    def set_contract_status(self, contract_id: str, status: ContractStatus) -> None:
+        """Move a contract to a new lifecycle state."""
+        self._contracts[contract_id].status = status
+    
+    def set_contract_compliance(self, contract_id: str, compliance: ComplianceStatus,
+                                score: Optional[float] = None) -> None:
+        """Record a new SB 988 compliance verdict for a contract."""
+        contract = self._contracts[contract_id]
+        contract.sb988_compliant = compliance
+        if score is not None:
+            contract.compliance_score = score
+    
+    def set_contract_end_date(self, contract_id: str, end_date: Optional[date]) -> None:
+        """Move a contract's end date, rescheduling its expiry if it is active."""
+        self._contracts[contract_id].end_date = end_date
+    
+    def contract_status_counts(self) -> Dict[ContractStatus, int]:
+        """Count contracts in each lifecycle state."""
+        counts = np.bincount(self._contract_status[:self._n_contracts],
+                             minlength=max(ContractStatus) + 1)
+        return {status: int(counts[status]) for status in ContractStatus}
+    
+    def evaluate_compliance(self, contract: Contract, scenario_key: Hashable,
+                            scorer: Callable[[Contract], Tuple[ComplianceStatus, float]]
+                            ) -> Tuple[ComplianceStatus, float]:
+        """
+        Evaluate a contract's SB 988 compliance under a scenario and record it.
+        
+        ``scorer`` must depend only on the contract terms that make up the
+        cache key, so contracts with identical terms share one evaluation.
+        A contract whose terms change simply maps to a different key.
+        Scenarios whose ``apply`` accepts an ``engine`` keyword are handed
+        the engine so they can score contracts through this method.
+        """
+        key = (
+            contract.exclusivity_clause,
+            contract.location_requirements,
+            contract.equipment_provided,
+            contract.supervision_level,
+            contract.payment_terms,
+            scenario_key,
+        )
+        verdict = self._compliance_cache.get(key)
+        if verdict is None:
+            verdict = scorer(contract)
+            self._compliance_cache[key] = verdict
+        
+        status, score = verdict
+        if contract.sb988_compliant is not status or contract.compliance_score != score:
+            self.set_contract_compliance(contract.id, status, score)
+        return verdict
+    
+    def record_transaction(self, transaction: Transaction) -> None:
+        """Append a transaction to the ledger."""
+        self.transactions.add(transaction)
+    
+    def transaction_volume(self, start: date, end: date) -> Decimal:
+        """Total transaction amount between two dates, inclusive."""
+        return from_cents(self.transactions.volume_cents(start.toordinal(), end.toordinal()))
+    
     def set_behavioral_models(self, 
                             freelancer_model: Callable = None,
                             client_model: Callable = None,
-                            market_model: Callable = None) -> None:
-        """Inject behavioral models into the simulation."""
+                            market_model: Callable = None,
+                            freelancer_kernel: Callable = None,
+                            freelancer_action_handler: Callable = None) -> None:
+        """
+        Inject behavioral models into the simulation.
+        
+        ``freelancer_kernel`` is a vectorized alternative to the per-agent
+        freelancer model, typically compiled with ``numba.njit(parallel=True)``.
+        It is called once per step as
+        ``kernel(*columns, market_state_arr, draws, out_actions)`` where
+        ``columns`` are the float64 arrays named in ``FREELANCER_SOA_FIELDS``,
+        ``market_state_arr`` holds the numeric fields of the latest market
+        snapshot and ``draws`` holds one uniform random number per freelancer,
+        drawn up front so results do not depend on thread scheduling.
+        Models and handlers that accept an ``rng`` keyword receive the
+        engine's generator through it; others can read ``engine.rng``.
+        Nonzero entries written to ``out_actions`` are passed to
+        ``freelancer_action_handler`` for the matching freelancer.
+        """
         if freelancer_model:
             self.freelancer_behavior_model = freelancer_model
+        if freelancer_kernel:
+            self.freelancer_kernel = freelancer_kernel
+        if freelancer_action_handler:
+            self.freelancer_action_handler = freelancer_action_handler
         if client_model:
             self.client_behavior_model = client_model
         if market_model:
@@ -114,22 +439,10 @@ class SimulationEngine:
         """Execute one simulation time step."""
         self.logger.debug(f"Executing simulation step for {self.current_time}")
         
-        # 1. Update market conditions
-        self._update_market_conditions()
-        
-        # 2. Execute agent behaviors
-        self._execute_agent_behaviors()
+        for phase in self.STEP_PHASES:
+            getattr(self, phase)()
         
-        # 3. Process contract lifecycle
-        self._process_contracts()
-        
-        # 4. Apply regulatory scenarios
-        self._apply_regulatory_scenarios()
-        
-        # 5. Collect metrics
-        self._collect_step_metrics()
-        
-        # 6. Advance time
+        # Advance time
         self.current_time += self.config.time_step
     
     def run(self) -> Dict[str, Any]:
@@ -138,91 +451,280 @@ class SimulationEngine:
         
         # Initialize
         self.initialize_population()
+        if self._can_specialize_step() and self.__dict__.get('step') in (None, self._compiled_step):
+            self.step = self._compiled_step = self._compile_step()
         
-        # Main simulation loop
-        iteration = 0
-        while (self.current_time <= self.config.end_date and 
-               iteration < self.config.max_iterations):
-            
-            self.step()
-            iteration += 1
-            
-            # Check for convergence if needed
-            if self._check_convergence():
-                self.logger.info(f"Simulation converged after {iteration} iterations")
-                break
+        # Main event loop. A step left queued by an earlier run that stopped
+        # at its end date is dropped so only one step chain is ever pending.
+        self._iteration = 0
+        self._halted = False
+        step_event = self._step_event
+        self._event_queue = [entry for entry in self._event_queue if entry[3] != step_event]
+        heapq.heapify(self._event_queue)
+        self.schedule(self.current_time, self.STEP_PRIORITY, step_event)
+        
+        queue = self._event_queue
+        end_date = self.config.end_date
+        heappop = heapq.heappop
+        while queue and not self._halted and queue[0][0] <= end_date:
+            event_time, _, _, fn = heappop(queue)
+            self.current_time = event_time
+            fn()
         
-        self.logger.info(f"Simulation completed after {iteration} iterations")
+        self.logger.info(f"Simulation completed after {self._iteration} iterations")
         
         # Generate final results
         return self._generate_results()
     
+    def _can_specialize_step(self) -> bool:
+        """Whether ``step`` and its phases are the stock implementations."""
+        cls = type(self)
+        return all(
+            getattr(cls, name) is getattr(SimulationEngine, name, None)
+            for name in ('step',) + tuple(self.STEP_PHASES)
+        )
+    
+    def _compile_step(self) -> Callable[[], None]:
+        """
+        Build a step function specialized to the models currently injected.
+        
+        Follows ``STEP_PHASES`` but leaves out phases with no model or
+        scenario to run, so their per-step checks disappear. The generated
+        step compares ``_enabled_phases`` against the set it was built for
+        and rebuilds itself when models or scenarios have been set or
+        cleared since, including by direct attribute writes mid-run.
+        """
+        enabled = self._enabled_phases()
+        body = "\n".join(f"    {phase}()" for phase, on in zip(self.STEP_PHASES, enabled) if on)
+        source = textwrap.dedent("""
+            def step():
+                if enabled_phases() != enabled:
+                    return respecialize()
+                logger.debug("Executing simulation step for %s", self.current_time)
+            {body}
+                self.current_time += self.config.time_step
+        """).format(body=body)
+        
+        namespace = {phase: getattr(self, phase) for phase in self.STEP_PHASES}
+        namespace.update(self=self, logger=self.logger, enabled=enabled,
+                         enabled_phases=self._enabled_phases,
+                         respecialize=self._respecialize_step)
+        exec(source, namespace)
+        return namespace['step']
+    
+    def _enabled_phases(self) -> Tuple[bool, ...]:
+        """Which of ``STEP_PHASES`` have anything to run, in phase order."""
+        enabled = {
+            '_execute_agent_behaviors': bool(self.freelancer_kernel or
+                                             self.freelancer_behavior_model or
+                                             self.client_behavior_model),
+            '_apply_regulatory_scenarios': bool(self.scenarios),
+        }
+        return tuple(enabled.get(phase, True) for phase in self.STEP_PHASES)
+    
+    def _respecialize_step(self) -> None:
+        """Rebuild the specialized step for the current models and run it."""
+        step = self._compile_step()
+        if self.__dict__.get('step') is self._compiled_step:
+            self.step = step
+        self._compiled_step = step
+        step()
+    
     def _update_market_conditions(self) -> None:
         """Update overall market conditions for this time step."""
         if self.market_dynamics_model:
-            # Apply market dynamics model
-            market_state = self.market_dynamics_model(
-                freelancers=self.freelancers,
-                clients=self.clients,
-                contracts=self.contracts,
-                current_time=self.current_time
-            )
-        
-        # Create market snapshot
-        snapshot = MarketSnapshot(
-            timestamp=self.current_time,
+            self._apply_market_dynamics()
+        self._record_market_snapshot()
+    
+    def _apply_market_dynamics(self) -> None:
+        """Apply the market dynamics model."""
+        model = self.market_dynamics_model
+        extra = self._rng_kwargs(model)
+        market_state = model(
+            freelancers=self.freelancers,
+            clients=self.clients,
+            contracts=self.contracts,
+            current_time=self.current_time,
+            **extra
+        )
+    
+    def _record_market_snapshot(self) -> None:
+        """Append this step's market indicators to the market history."""
+        today = self.current_time.toordinal()
+        compliance_rate = self._calculate_compliance_rate()
+        self._market_history.record(
+            self.current_time,
             total_freelancers=len(self.freelancers),
             total_clients=len(self.clients),
-            active_contracts=len([c for c in self.contracts.values() 
-                                if c.status.value == "active"]),
-            total_transaction_volume=sum(t.amount for t in self.transactions
-                                       if t.transaction_date.date() == self.current_time.date()),
+            active_contracts=self._active_contract_count,
+            total_transaction_volume=self.transactions.daily_volume(today),
             average_hourly_rate=self._calculate_average_hourly_rate(),
-            compliance_rate=self._calculate_compliance_rate()
+            compliance_rate=compliance_rate
         )
         
-        self.market_snapshots.append(snapshot)
+        self._update_convergence_window(compliance_rate)
     
     def _execute_agent_behaviors(self) -> None:
         """Execute behavioral models for all agents."""
+        # Execute vectorized freelancer behaviors
+        if self.freelancer_kernel:
+            self._execute_freelancer_kernel()
+        
+        if not (self.freelancer_behavior_model or self.client_behavior_model):
+            return
+        market_state = self.market_snapshots[-1] if self.market_snapshots else None
+        
         # Execute freelancer behaviors
         if self.freelancer_behavior_model:
-            for freelancer in self.freelancers.values():
-                self.freelancer_behavior_model(
-                    freelancer=freelancer,
-                    market_state=self.market_snapshots[-1] if self.market_snapshots else None,
-                    available_clients=list(self.clients.values()),
-                    current_time=self.current_time
-                )
+            self._execute_freelancer_behaviors(market_state)
         
         # Execute client behaviors
         if self.client_behavior_model:
-            for client in self.clients.values():
-                self.client_behavior_model(
-                    client=client,
-                    market_state=self.market_snapshots[-1] if self.market_snapshots else None,
-                    available_freelancers=list(self.freelancers.values()),
-                    current_time=self.current_time
+            self._execute_client_behaviors(market_state)
+    
+    def _execute_freelancer_behaviors(self, market_state: Optional[MarketSnapshot]) -> None:
+        """Run the freelancer behavior model for every freelancer."""
+        if self._clients_view is None:
+            self._clients_view = tuple(self.clients.values())
+        
+        model = self.freelancer_behavior_model
+        available_clients = self._clients_view
+        current_time = self.current_time
+        extra = self._rng_kwargs(model)
+        for freelancer in self._freelancers.values():
+            model(
+                freelancer=freelancer,
+                market_state=market_state,
+                available_clients=available_clients,
+                current_time=current_time,
+                **extra
+            )
+    
+    def _execute_client_behaviors(self, market_state: Optional[MarketSnapshot]) -> None:
+        """Run the client behavior model for every client."""
+        if self._freelancers_view is None:
+            self._freelancers_view = tuple(self.freelancers.values())
+        
+        model = self.client_behavior_model
+        available_freelancers = self._freelancers_view
+        current_time = self.current_time
+        extra = self._rng_kwargs(model)
+        for client in self.clients.values():
+            model(
+                client=client,
+                market_state=market_state,
+                available_freelancers=available_freelancers,
+                current_time=current_time,
+                **extra
+            )
+    
+    def _execute_freelancer_kernel(self) -> None:
+        """Run the freelancer kernel over the SoA columns and dispatch its actions."""
+        n = self._n_freelancers
+        if not n:
+            return
+        if self._fl_columns_stale:
+            self._refresh_freelancer_columns()
+        actions = self._fl_actions[:n]
+        actions.fill(0)
+        draws = self._fl_draws[:n]
+        self._kernel_rng.random(out=draws)
+        
+        columns = [self._fl_soa[column][:n] for column in FREELANCER_SOA_FIELDS]
+        self.freelancer_kernel(*columns, self._market_state_array(), draws, actions)
+        
+        # Scatter action codes back to the freelancer objects
+        handler = self.freelancer_action_handler
+        if handler:
+            freelancer_ids = self._freelancer_ids
+            current_time = self.current_time
+            extra = self._rng_kwargs(handler)
+            for idx in np.flatnonzero(actions):
+                freelancer_id = freelancer_ids[idx]
+                handler(
+                    freelancer=self.freelancers[freelancer_id],
+                    action=int(actions[idx]),
+                    current_time=current_time,
+                    **extra
                 )
     
+    def _rng_kwargs(self, fn: Callable) -> Dict[str, np.random.Generator]:
+        """Extra keyword arguments passing the engine's generator to ``fn`` if it takes one."""
+        return {'rng': self.rng} if self._accepts(fn, 'rng') else {}
+    
+    def _accepts(self, fn: Callable, name: str) -> bool:
+        """Cached ``_accepts_keyword`` for callbacks invoked every step."""
+        key = (fn, name)
+        try:
+            return self._keyword_support[key]
+        except KeyError:
+            accepted = self._keyword_support[key] = _accepts_keyword(fn, name)
+            return accepted
+        except TypeError:
+            # Unhashable callable; nothing to key the cache on
+            return _accepts_keyword(fn, name)
+    
+    def _market_state_array(self) -> np.ndarray:
+        """Pack the latest market snapshot's numeric fields into a float64 array."""
+        if not self.market_snapshots:
+            return np.zeros(7, dtype=np.float64)
+        
+        history = self._market_history
+        return np.array([
+            history.column('active_contracts')[-1],
+            history.column('total_transaction_volume')[-1] / 100,
+            history.column('average_hourly_rate')[-1],
+            history.column('compliance_rate')[-1],
+            history.column('market_demand')[-1],
+            history.column('regulatory_pressure')[-1],
+            history.column('economic_uncertainty')[-1],
+        ], dtype=np.float64)
+    
+    def _step_event(self) -> None:
+        """Run one time step and schedule the next one."""
+        if self._iteration >= self.config.max_iterations:
+            self._halted = True
+            return
+        
+        self.step()
+        self._iteration += 1
+        
+        # Check for convergence if needed
+        if self._check_convergence():
+            self.logger.info(f"Simulation converged after {self._iteration} iterations")
+            self._halted = True
+        else:
+            self.schedule(self.current_time, self.STEP_PRIORITY, self._step_event)
+    
     def _process_contracts(self) -> None:
         """Process contract lifecycle events."""
-        for contract in self.contracts.values():
-            # Update contract status based on dates and conditions
-            if (contract.end_date and 
-                self.current_time.date() > contract.end_date and
-                contract.status.value == "active"):
-                contract.status = contract.status.COMPLETED
+        heap = self._expiry_heap
+        today = self.current_time.toordinal()
+        while heap and heap[0][0] < today:
+            end_ordinal, contract_id = heapq.heappop(heap)
+            contract = self.contracts.get(contract_id)
+            if contract is None or contract.status is not ContractStatus.ACTIVE:
+                continue
+            
+            # Update contract status based on dates and conditions. An entry
+            # whose end date has since moved or been cleared is skipped; the
+            # move queued a fresh entry if one is still needed.
+            if contract.end_date and contract.end_date.toordinal() < today:
+                contract.status = ContractStatus.COMPLETED
     
     def _apply_regulatory_scenarios(self) -> None:
         """Apply active regulatory scenarios to the simulation."""
         for scenario in self.scenarios:
             if scenario.is_active(self.current_time):
+                # Scenarios that take an ``engine`` keyword can route their
+                # scoring through evaluate_compliance
+                extra = {'engine': self} if self._accepts(scenario.apply, 'engine') else {}
                 scenario.apply(
                     freelancers=self.freelancers,
                     clients=self.clients,
                     contracts=self.contracts,
-                    current_time=self.current_time
+                    current_time=self.current_time,
+                    **extra
                 )
     
     def _collect_step_metrics(self) -> None:
@@ -238,32 +740,149 @@ class SimulationEngine:
     def _check_convergence(self) -> bool:
         """Check if the simulation has converged to a steady state."""
         # Simple convergence check based on recent market snapshots
-        if len(self.market_snapshots) < 10:
+        if len(self._conv_window) < self.CONVERGENCE_WINDOW:
             return False
         
-        recent_snapshots = self.market_snapshots[-10:]
-        compliance_rates = [s.compliance_rate for s in recent_snapshots]
-        
         # Check if compliance rate has stabilized
-        variance = np.var(compliance_rates)
+        variance = self._conv_m2 / self.CONVERGENCE_WINDOW
         return variance < self.config.convergence_threshold
     
+    def _update_convergence_window(self, value: float) -> None:
+        """Push a compliance rate into the rolling window, evicting the oldest."""
+        window = self._conv_window
+        if len(window) == window.maxlen:
+            # Welford removal of the sample about to be evicted
+            old = window[0]
+            n = len(window) - 1
+            if n:
+                delta = old - self._conv_mean
+                self._conv_mean -= delta / n
+                self._conv_m2 -= delta * (old - self._conv_mean)
+            else:
+                self._conv_mean = 0.0
+                self._conv_m2 = 0.0
+        
+        window.append(value)
+        delta = value - self._conv_mean
+        self._conv_mean += delta / len(window)
+        self._conv_m2 = max(self._conv_m2 + delta * (value - self._conv_mean), 0.0)
+    
+    def _sync_contract_row(self, idx: int, contract: Contract) -> None:
+        """Bring the market counters and mirror row ``idx`` up to date with a contract."""
+        was_active = self._contract_status[idx] == ContractStatus.ACTIVE
+        is_active = contract.status is ContractStatus.ACTIVE
+        if was_active != is_active:
+            self._active_contract_count += 1 if is_active else -1
+        self._contract_status[idx] = contract.status
+        
+        # Queue an expiry whenever the contract becomes active or its end
+        # date moves while active; superseded heap entries are skipped later
+        end_ordinal = contract.end_date.toordinal() if contract.end_date else 0
+        if is_active and end_ordinal and (not was_active or
+                                          end_ordinal != self._contract_end[idx]):
+            heapq.heappush(self._expiry_heap, (end_ordinal, contract.id))
+        self._contract_end[idx] = end_ordinal
+        
+        is_compliant = contract.sb988_compliant is ComplianceStatus.COMPLIANT
+        if self._compliant_flag(idx) != is_compliant:
+            self._compliant_contract_count += 1 if is_compliant else -1
+            self._set_compliant_flag(idx, is_compliant)
+    
+    def _on_contract_change(self, contract: Contract, field_name: str) -> None:
+        """Observer for writes to a contract's status, compliance or end date."""
+        self._sync_contract_row(self._contract_index[contract.id], contract)
+    
+    def _contract_row(self, contract_id: str) -> int:
+        """Return the mirror row of a contract, appending an empty one if new."""
+        idx = self._contract_index.get(contract_id)
+        if idx is None:
+            if self._n_contracts == self._contract_status.size:
+                capacity = 2 * self._contract_status.size
+                self._contract_status = np.resize(self._contract_status, capacity)
+                self._compliant_bits = np.concatenate(
+                    (self._compliant_bits, np.zeros_like(self._compliant_bits)))
+                self._contract_end = np.resize(self._contract_end, capacity)
+            idx = self._n_contracts
+            self._contract_status[idx] = 0
+            self._set_compliant_flag(idx, False)
+            self._contract_end[idx] = 0
+            self._contract_index[contract_id] = idx
+            self._contract_ids.append(contract_id)
+            self._n_contracts += 1
+        return idx
+    
+    def _compliant_flag(self, idx: int) -> bool:
+        """Read the compliant bit of mirror row ``idx``."""
+        return bool(int(self._compliant_bits[idx >> 6]) >> (idx & 63) & 1)
+    
+    def _set_compliant_flag(self, idx: int, value: bool) -> None:
+        """Set or clear the compliant bit of mirror row ``idx``."""
+        word = int(self._compliant_bits[idx >> 6])
+        mask = 1 << (idx & 63)
+        self._compliant_bits[idx >> 6] = word | mask if value else word & ~mask
+    
+    def _register_freelancer(self, freelancer: Freelancer) -> None:
+        """Append a freelancer's numeric fields to the SoA buffers."""
+        if self._n_freelancers == self._fl_actions.size:
+            capacity = 2 * self._fl_actions.size
+            for column, values in self._fl_soa.items():
+                self._fl_soa[column] = np.resize(values, capacity)
+            self._fl_actions = np.resize(self._fl_actions, capacity)
+            self._fl_draws = np.resize(self._fl_draws, capacity)
+        
+        idx = self._n_freelancers
+        self._write_freelancer_row(idx, freelancer)
+        self._freelancer_index[freelancer.id] = idx
+        self._freelancer_ids.append(freelancer.id)
+        self._n_freelancers += 1
+    
+    def _unregister_freelancer(self, freelancer_id: str) -> None:
+        """Drop a freelancer from the SoA buffers by swapping in the last row."""
+        idx = self._freelancer_index.pop(freelancer_id)
+        last = self._n_freelancers - 1
+        if idx != last:
+            moved_id = self._freelancer_ids[last]
+            for values in self._fl_soa.values():
+                values[idx] = values[last]
+            self._freelancer_ids[idx] = moved_id
+            self._freelancer_index[moved_id] = idx
+        self._freelancer_ids.pop()
+        self._n_freelancers = last
+    
+    def _on_freelancer_change(self, freelancer: Freelancer, attribute: str) -> None:
+        """Observer for writes to a freelancer's mirrored numeric attributes."""
+        column = _SOA_COLUMN_BY_ATTRIBUTE[attribute]
+        if column == 'rate' or self.freelancer_kernel:
+            idx = self._freelancer_index[freelancer.id]
+            self._fl_soa[column][idx] = float(getattr(freelancer, attribute))
+        else:
+            self._fl_columns_stale = True
+    
+    def _refresh_freelancer_columns(self) -> None:
+        """Rewrite every SoA row after kernel inputs changed with no kernel installed."""
+        freelancers = self._freelancers
+        for idx, freelancer_id in enumerate(self._freelancer_ids):
+            self._write_freelancer_row(idx, freelancers[freelancer_id])
+        self._fl_columns_stale = False
+    
+    def _write_freelancer_row(self, idx: int, freelancer: Freelancer) -> None:
+        """Copy a freelancer's numeric attributes into SoA row ``idx``."""
+        for column, attribute in FREELANCER_SOA_FIELDS.items():
+            self._fl_soa[column][idx] = float(getattr(freelancer, attribute))
+    
     def _calculate_average_hourly_rate(self) -> float:
         """Calculate the current average hourly rate across all freelancers."""
-        if not self.freelancers:
+        if not self._n_freelancers:
             return 0.0
         
-        rates = [float(f.hourly_rate) for f in self.freelancers.values()]
-        return np.mean(rates)
+        return float(self._fl_soa['rate'][:self._n_freelancers].mean())
     
     def _calculate_compliance_rate(self) -> float:
         """Calculate the current compliance rate across all contracts."""
         if not self.contracts:
             return 0.0
         
-        compliant_contracts = sum(1 for c in self.contracts.values() 
-                                if c.sb988_compliant.value == "compliant")
-        return compliant_contracts / len(self.contracts)
+        return self._compliant_contract_count / len(self.contracts)
     
     def _generate_results(self) -> Dict[str, Any]:
         """Generate comprehensive simulation results."""
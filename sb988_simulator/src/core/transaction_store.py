@@ -0,0 +1,170 @@
+"""
+Columnar transaction ledger for the SB 988 compliance simulator.
+
+This module keeps transactions as parallel NumPy columns sorted by day, so
+volume over any date window is a binary search plus a slice sum.
+Transaction objects are rebuilt on access.
+"""
+
+from collections.abc import Sequence
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .entities import Transaction, to_cents, from_cents
+
+
+# Integer columns; money is stored in cents and repeated strings as codes
+# into a per-store vocabulary
+_INT_COLUMNS = {
+    'date_ordinal': np.int32,
+    'amount': np.int64,
+    'compliance_costs': np.int64,
+    'administrative_overhead': np.int64,
+    'dispute_costs': np.int64,
+    'contract_idx': np.int32,
+    'freelancer_idx': np.int32,
+    'client_idx': np.int32,
+    'payment_method_idx': np.int32,
+    'status_int': np.int32,
+}
+
+# Fields kept as plain Python lists, one entry per row
+_OBJECT_COLUMNS = ('id', 'transaction_date', 'description', 'reference_number')
+
+
+class _Vocabulary:
+    """Bidirectional mapping between repeated strings and integer codes."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class TransactionStore(Sequence):
+    """
+    Append-mostly transaction ledger stored as a structure of arrays.
+
+    Rows are kept sorted by transaction day. Transactions normally arrive in
+    time order. An out-of-order transaction is inserted at its sorted
+    position, which shifts the indices of later rows.
+
+    Amounts are held in whole cents, so sub-cent values are rounded half up
+    on the way in (5.005 is stored and returned as 5.01).
+
+    Indexing returns a detached Transaction rebuilt from the columns;
+    mutating it does not change the store. Use ``update_status`` to change
+    a stored transaction.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in _INT_COLUMNS.items()
+        }
+        self._objects: Dict[str, list] = {name: [] for name in _OBJECT_COLUMNS}
+        self._vocab: Dict[str, _Vocabulary] = {
+            name: _Vocabulary()
+            for name in ('contract_idx', 'freelancer_idx', 'client_idx',
+                         'payment_method_idx', 'status_int')
+        }
+        self._size = 0
+
+    def add(self, txn: Transaction) -> int:
+        """Store a transaction and return its row index."""
+        n = self._size
+        if n == len(self._columns['amount']):
+            for name, column in self._columns.items():
+                self._columns[name] = np.resize(column, 2 * n)
+
+        day = txn.transaction_date.toordinal()
+        days = self._columns['date_ordinal']
+        pos = n
+        if n and day < days[n - 1]:
+            # Out-of-order arrival: shift later days up to keep rows sorted
+            pos = int(np.searchsorted(days[:n], day, 'right'))
+            for column in self._columns.values():
+                column[pos + 1:n + 1] = column[pos:n]
+
+        row = {
+            'date_ordinal': day,
+            'amount': txn.amount_cents,
+            'compliance_costs': to_cents(txn.compliance_costs),
+            'administrative_overhead': to_cents(txn.administrative_overhead),
+            'dispute_costs': to_cents(txn.dispute_costs),
+            'contract_idx': self._vocab['contract_idx'].encode(txn.contract_id),
+            'freelancer_idx': self._vocab['freelancer_idx'].encode(txn.freelancer_id),
+            'client_idx': self._vocab['client_idx'].encode(txn.client_id),
+            'payment_method_idx': self._vocab['payment_method_idx'].encode(txn.payment_method),
+            'status_int': self._vocab['status_int'].encode(txn.status),
+        }
+        for name, value in row.items():
+            self._columns[name][pos] = value
+        for name, values in self._objects.items():
+            values.insert(pos, getattr(txn, name))
+
+        self._size = n + 1
+        return pos
+
+    append = add
+
+    def update_status(self, index: int, status: str) -> None:
+        """Set the status of the stored transaction at ``index``."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("transaction index out of range")
+        self._columns['status_int'][index] = self._vocab['status_int'].encode(status)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a view of one integer column across all stored rows."""
+        return self._columns[name][:self._size]
+
+    def volume_cents(self, first_day: int, last_day: int) -> int:
+        """Sum amounts in cents for day ordinals in ``[first_day, last_day]``."""
+        days = self.column('date_ordinal')
+        lo = np.searchsorted(days, first_day, 'left')
+        hi = np.searchsorted(days, last_day, 'right')
+        return int(self._columns['amount'][lo:hi].sum())
+
+    def daily_volume(self, day_ordinal: int) -> int:
+        """Sum amounts in cents for a single day ordinal."""
+        return self.volume_cents(day_ordinal, day_ordinal)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("transaction index out of range")
+
+        columns = self._columns
+        vocab = self._vocab
+        objects = self._objects
+        return Transaction(
+            id=objects['id'][index],
+            contract_id=vocab['contract_idx'].values[columns['contract_idx'][index]],
+            freelancer_id=vocab['freelancer_idx'].values[columns['freelancer_idx'][index]],
+            client_id=vocab['client_idx'].values[columns['client_idx'][index]],
+            amount=from_cents(columns['amount'][index]),
+            transaction_date=objects['transaction_date'][index],
+            payment_method=vocab['payment_method_idx'].values[columns['payment_method_idx'][index]],
+            status=vocab['status_int'].values[columns['status_int'][index]],
+            compliance_costs=from_cents(columns['compliance_costs'][index]),
+            administrative_overhead=from_cents(columns['administrative_overhead'][index]),
+            dispute_costs=from_cents(columns['dispute_costs'][index]),
+            description=objects['description'][index],
+            reference_number=objects['reference_number'][index],
+        )
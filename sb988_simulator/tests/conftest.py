@@ -0,0 +1,43 @@
+"""Shared pytest configuration for the SB 988 compliance simulator."""
+
+import sys
+import types
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / 'src'
+sys.path.insert(0, str(SRC))
+
+
+class StubScenario:
+    """Minimal stand-in for core.scenario.Scenario when that module is absent."""
+
+    name = "stub"
+
+    def is_active(self, current_time):
+        return True
+
+    def apply(self, freelancers, clients, contracts, current_time):
+        pass
+
+    def get_results(self):
+        return {}
+
+
+class StubMetricsCollector:
+    """Minimal stand-in for core.metrics.MetricsCollector when that module is absent."""
+
+    def collect_step_metrics(self, **kwargs):
+        pass
+
+    def get_summary(self):
+        return {}
+
+
+# The core package imports these modules, so only stub the ones this checkout
+# does not ship
+for module_name, attribute, stub in (('scenario', 'Scenario', StubScenario),
+                                     ('metrics', 'MetricsCollector', StubMetricsCollector)):
+    if not (SRC / 'core' / f'{module_name}.py').exists():
+        module = types.ModuleType(f'core.{module_name}')
+        setattr(module, attribute, stub)
+        sys.modules[f'core.{module_name}'] = module
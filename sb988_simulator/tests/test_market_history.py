@@ -0,0 +1,92 @@
+"""Tests for the columnar market history."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from core.entities import MarketSnapshot
+from core.market_history import MarketHistory
+
+
+START = datetime(2024, 1, 1)
+
+
+def record(history: MarketHistory, step: int) -> None:
+    history.record(
+        START + timedelta(days=step),
+        total_freelancers=100 + step,
+        total_clients=20,
+        active_contracts=step,
+        total_transaction_volume=12345 * step,
+        average_hourly_rate=75.0 + step,
+        compliance_rate=0.5,
+    )
+
+
+def test_record_stores_values():
+    history = MarketHistory()
+    record(history, 1)
+
+    snapshot = history[0]
+    assert len(history) == 1
+    assert snapshot.timestamp == START + timedelta(days=1)
+    assert snapshot.total_freelancers == 101
+    assert snapshot.active_contracts == 1
+    assert snapshot.total_transaction_volume == Decimal("123.45")
+    assert snapshot.average_hourly_rate == 76.0
+
+
+def test_omitted_fields_use_snapshot_defaults():
+    history = MarketHistory()
+    record(history, 0)
+
+    defaults = MarketSnapshot(
+        timestamp=START, total_freelancers=0, total_clients=0, active_contracts=0,
+        total_transaction_volume=Decimal("0"), average_hourly_rate=0.0,
+        compliance_rate=0.0,
+    )
+    snapshot = history[0]
+    assert snapshot.market_demand == defaults.market_demand
+    assert snapshot.regulatory_pressure == defaults.regulatory_pressure
+    assert snapshot.economic_uncertainty == defaults.economic_uncertainty
+
+
+def test_grows_beyond_initial_capacity():
+    history = MarketHistory(capacity=2)
+    for step in range(9):
+        record(history, step)
+
+    assert len(history) == 9
+    assert list(history.column('active_contracts')) == list(range(9))
+    assert [s.total_freelancers for s in history] == [100 + step for step in range(9)]
+
+
+def test_snapshots_round_trip():
+    history = MarketHistory()
+    for step in range(4):
+        record(history, step)
+
+    rebuilt = MarketHistory.from_snapshots(history)
+    assert list(rebuilt) == list(history)
+    assert history[-1] == history[3]
+    assert history[1:3] == [history[1], history[2]]
+
+
+def test_index_out_of_range():
+    history = MarketHistory()
+    with pytest.raises(IndexError):
+        history[0]
+
+
+def test_append_accepts_snapshots():
+    history = MarketHistory()
+    snapshot = MarketSnapshot(
+        timestamp=START, total_freelancers=3, total_clients=2, active_contracts=1,
+        total_transaction_volume=Decimal("10.50"), average_hourly_rate=60.0,
+        compliance_rate=1.0, market_demand=0.7,
+    )
+    history.append(snapshot)
+
+    assert history[0] == snapshot
+    assert history.column('total_transaction_volume')[0] == 1050
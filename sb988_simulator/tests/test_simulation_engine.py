@@ -0,0 +1,450 @@
+"""Tests for the simulation engine's maintained state and scheduling."""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from core.entities import (
+    Client, ClientType, ComplianceStatus, Contract, ContractStatus,
+    Freelancer, FreelancerType,
+)
+from core.simulation_engine import SimulationConfig, SimulationEngine
+
+
+START = datetime(2024, 1, 1)
+
+
+def make_engine(days: int = 5, **overrides) -> SimulationEngine:
+    values = dict(start_date=START, end_date=START + timedelta(days=days - 1),
+                  random_seed=7, convergence_threshold=-1.0)
+    values.update(overrides)
+    return SimulationEngine(SimulationConfig(**values))
+
+
+def make_freelancer(freelancer_id: str, rate: str = "50", **overrides) -> Freelancer:
+    values = dict(id=freelancer_id, name=freelancer_id,
+                  freelancer_type=FreelancerType.GIG_WORKER, skills=[],
+                  experience_years=3.0, hourly_rate=Decimal(rate),
+                  location="CA", created_at=START)
+    values.update(overrides)
+    return Freelancer(**values)
+
+
+def make_client(client_id: str) -> Client:
+    return Client(id=client_id, name=client_id, client_type=ClientType.STARTUP,
+                  industry="software", size="1-10", location="CA", created_at=START)
+
+
+def make_contract(contract_id: str, status: ContractStatus = ContractStatus.ACTIVE,
+                  **overrides) -> Contract:
+    values = dict(id=contract_id, freelancer_id="f", client_id="c", title="work",
+                  description="", status=status, created_at=START)
+    values.update(overrides)
+    return Contract(**values)
+
+
+class RecordingScenario:
+    """Scenario with the original apply signature that counts its calls."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_active(self, current_time):
+        return True
+
+    def apply(self, freelancers, clients, contracts, current_time):
+        self.calls += 1
+
+    def get_results(self):
+        return {}
+
+
+# Market counters
+
+def test_counters_follow_contract_helpers():
+    engine = make_engine()
+    engine.add_contract(make_contract("a"))
+    engine.add_contract(make_contract("b", sb988_compliant=ComplianceStatus.COMPLIANT))
+    engine.add_contract(make_contract("c", status=ContractStatus.DRAFT))
+
+    assert engine._active_contract_count == 2
+    assert engine._calculate_compliance_rate() == pytest.approx(1 / 3)
+
+    engine.set_contract_status("a", ContractStatus.TERMINATED)
+    engine.set_contract_compliance("c", ComplianceStatus.COMPLIANT, score=0.9)
+
+    assert engine._active_contract_count == 1
+    assert engine._calculate_compliance_rate() == pytest.approx(2 / 3)
+    assert engine.contracts["c"].compliance_score == 0.9
+
+
+def test_in_place_contract_writes_reach_the_snapshots():
+    engine = make_engine(days=3)
+    contract = make_contract("a", status=ContractStatus.DRAFT)
+    engine.add_contract(contract)
+
+    def activate():
+        contract.status = ContractStatus.ACTIVE
+        contract.sb988_compliant = ComplianceStatus.COMPLIANT
+
+    engine.schedule(START, 1, activate)
+    engine.run()
+
+    assert list(engine.market_snapshots.column('active_contracts')) == [0, 1, 1]
+    assert list(engine.market_snapshots.column('compliance_rate')) == [0.0, 1.0, 1.0]
+
+
+def test_remove_contract_clears_counters_and_expiry():
+    engine = make_engine(days=6)
+    engine.add_contract(make_contract("a", end_date=date(2024, 1, 2),
+                                      sb988_compliant=ComplianceStatus.COMPLIANT))
+    engine.add_contract(make_contract("b", end_date=date(2024, 1, 3)))
+
+    removed = engine.remove_contract("a")
+    removed.status = ContractStatus.DRAFT
+
+    assert "a" not in engine.contracts
+    assert engine.remove_contract("a") is None
+    assert engine._active_contract_count == 1
+    assert engine._compliant_contract_count == 0
+    assert all(contract_id != "a" for _, contract_id in engine._expiry_heap)
+
+    engine.run()
+    assert engine.contracts["b"].status is ContractStatus.COMPLETED
+    assert engine.contract_status_counts()[ContractStatus.COMPLETED] == 1
+
+
+def test_compliant_bits_match_the_counter():
+    engine = make_engine()
+    for i in range(300):
+        compliance = ComplianceStatus.COMPLIANT if i % 3 == 0 else ComplianceStatus.PENDING_REVIEW
+        engine.add_contract(make_contract(f"c{i}", sb988_compliant=compliance))
+    for i in range(0, 300, 7):
+        engine.remove_contract(f"c{i}")
+
+    expected = sum(c.sb988_compliant is ComplianceStatus.COMPLIANT
+                   for c in engine.contracts.values())
+    popcount = sum(int(word).bit_count() for word in engine._compliant_bits)
+    assert engine._compliant_contract_count == expected == popcount
+
+
+def test_contract_status_counts():
+    engine = make_engine()
+    engine.add_contract(make_contract("a"))
+    engine.add_contract(make_contract("b", status=ContractStatus.DRAFT))
+    engine.add_contract(make_contract("c", status=ContractStatus.DRAFT))
+
+    counts = engine.contract_status_counts()
+    assert counts[ContractStatus.ACTIVE] == 1
+    assert counts[ContractStatus.DRAFT] == 2
+    assert counts[ContractStatus.DISPUTED] == 0
+    assert ContractStatus("active") is ContractStatus.ACTIVE
+
+
+# Freelancer columns
+
+def test_average_rate_follows_rate_writes():
+    engine = make_engine()
+    freelancers = [make_freelancer(f"f{i}", rate="10") for i in range(3)]
+    for freelancer in freelancers:
+        engine.add_freelancer(freelancer)
+
+    freelancers[0].hourly_rate = Decimal("40")
+    engine.set_freelancer_rate("f1", Decimal("70"))
+    engine.remove_freelancer("f2")
+
+    assert engine._calculate_average_hourly_rate() == pytest.approx(55.0)
+
+
+def test_kernel_sees_current_columns_and_dispatches_actions():
+    engine = make_engine(days=2)
+    freelancers = [make_freelancer(f"f{i}") for i in range(4)]
+    for freelancer in freelancers:
+        engine.add_freelancer(freelancer)
+    freelancers[2].risk_tolerance = 0.9
+
+    seen_risk = []
+    handled = []
+
+    def kernel(risk, rate, admin, negotiation, knowledge, experience,
+               dependency, market_state, draws, out_actions):
+        seen_risk.append(risk.copy())
+        out_actions[risk > 0.8] = 3
+
+    def handler(freelancer, action, current_time):
+        handled.append((freelancer.id, action))
+        freelancer.risk_tolerance = 0.1
+
+    engine.set_behavioral_models(freelancer_kernel=kernel,
+                                 freelancer_action_handler=handler)
+    engine.run()
+
+    assert list(seen_risk[0]) == [0.5, 0.5, 0.9, 0.5]
+    assert list(seen_risk[1]) == [0.5, 0.5, 0.1, 0.5]
+    assert handled == [("f2", 3)]
+
+
+# Convergence window
+
+def test_run_converges_once_the_window_is_flat():
+    engine = make_engine(days=30, convergence_threshold=0.001)
+    engine.run()
+
+    assert len(engine.market_snapshots) == SimulationEngine.CONVERGENCE_WINDOW
+
+
+def test_convergence_variance_matches_numpy():
+    engine = make_engine()
+    values = np.random.default_rng(0).random(25)
+    for value in values:
+        engine._update_convergence_window(float(value))
+
+    window = values[-SimulationEngine.CONVERGENCE_WINDOW:]
+    assert engine._conv_m2 / SimulationEngine.CONVERGENCE_WINDOW == pytest.approx(np.var(window))
+
+
+# Event queue
+
+def test_scheduled_events_run_in_time_then_priority_order():
+    engine = make_engine(days=3)
+    order = []
+    engine.schedule(START + timedelta(days=1), 5, lambda: order.append("late"))
+    engine.schedule(START, 9, lambda: order.append("low"))
+    engine.schedule(START, 1, lambda: order.append("high"))
+    engine.run()
+
+    assert order == ["high", "low", "late"]
+
+
+def test_rerun_with_a_later_end_date_steps_each_day_once():
+    engine = make_engine(days=10)
+    engine.run()
+    engine.config.end_date = START + timedelta(days=19)
+    engine.run()
+
+    assert len(engine.market_snapshots) == 20
+
+
+def test_max_iterations_caps_the_step_count():
+    engine = make_engine(days=10, max_iterations=0)
+    engine.run()
+    assert len(engine.market_snapshots) == 0
+
+    engine.config.max_iterations = 3
+    engine.run()
+    assert len(engine.market_snapshots) == 3
+
+
+# Compliance cache and scenarios
+
+def test_compliance_verdicts_are_shared_by_identical_terms():
+    engine = make_engine()
+    engine.add_contract(make_contract("a", exclusivity_clause=True))
+    engine.add_contract(make_contract("b", exclusivity_clause=True))
+    engine.add_contract(make_contract("c"))
+    calls = []
+
+    def scorer(contract):
+        calls.append(contract.id)
+        if contract.exclusivity_clause:
+            return ComplianceStatus.NON_COMPLIANT, 0.2
+        return ComplianceStatus.COMPLIANT, 0.9
+
+    for contract in engine.contracts.values():
+        engine.evaluate_compliance(contract, "baseline", scorer)
+
+    assert calls == ["a", "c"]
+    assert engine.contracts["b"].sb988_compliant is ComplianceStatus.NON_COMPLIANT
+    assert engine._calculate_compliance_rate() == pytest.approx(1 / 3)
+
+
+def test_engine_is_passed_only_to_scenarios_that_accept_it():
+    engine = make_engine(days=3)
+
+    class EngineAwareScenario(RecordingScenario):
+        def apply(self, freelancers, clients, contracts, current_time, engine):
+            self.calls += 1
+            self.engine = engine
+
+    plain, aware = RecordingScenario(), EngineAwareScenario()
+    engine.add_scenario(plain)
+    engine.add_scenario(aware)
+    engine.run()
+
+    assert plain.calls == aware.calls == 3
+    assert aware.engine is engine
+
+
+# Cached population views
+
+def test_population_views_are_reused_until_the_population_changes():
+    engine = make_engine(days=3)
+    engine.add_freelancer(make_freelancer("f0"))
+    engine.add_client(make_client("c0"))
+    seen = []
+
+    def client_model(client, market_state, available_freelancers, current_time):
+        seen.append(available_freelancers)
+        if len(seen) == 2:
+            engine.add_freelancer(make_freelancer("f1"))
+
+    engine.set_behavioral_models(client_model=client_model)
+    engine.run()
+
+    assert seen[0] is seen[1]
+    assert [f.id for f in seen[2]] == ["f0", "f1"]
+    with pytest.raises(TypeError):
+        engine.clients["c1"] = make_client("c1")
+
+
+# Specialized step
+
+def test_models_assigned_mid_run_are_picked_up():
+    engine = make_engine(days=5)
+    engine.add_client(make_client("c0"))
+    scenario = RecordingScenario()
+    days = []
+
+    def enable():
+        engine.client_behavior_model = lambda **kwargs: days.append(kwargs['current_time'].day)
+        engine.scenarios.append(scenario)
+
+    engine.schedule(START + timedelta(days=2), 1, enable)
+    engine.run()
+
+    # The event runs after day 3's step, so models apply from day 4
+    assert days == [4, 5]
+    assert scenario.calls == 2
+
+
+def test_overridden_phases_and_instance_steps_are_respected():
+    class QuietEngine(SimulationEngine):
+        def _collect_step_metrics(self):
+            self.collected = getattr(self, 'collected', 0) + 1
+
+    engine = QuietEngine(SimulationConfig(start_date=START, end_date=START + timedelta(days=4)))
+    engine.run()
+    assert engine.collected == 5
+
+    plain = make_engine(days=3)
+    steps = []
+
+    def custom_step():
+        steps.append(plain.current_time)
+        plain.current_time += plain.config.time_step
+
+    plain.step = custom_step
+    plain.run()
+    assert len(steps) == 3
+    assert plain.step is custom_step
+
+
+# Random streams
+
+def test_seeded_runs_are_reproducible():
+    def draws(engine):
+        values = []
+        engine.add_client(make_client("c0"))
+        engine.set_behavioral_models(
+            client_model=lambda client, market_state, available_freelancers,
+            current_time, rng: values.append(rng.random()))
+        engine.run()
+        return values
+
+    assert draws(make_engine(random_seed=3)) == draws(make_engine(random_seed=3))
+    assert draws(make_engine(random_seed=3)) != draws(make_engine(random_seed=4))
+
+
+def test_models_without_rng_keyword_still_run():
+    engine = make_engine(days=2)
+    engine.add_client(make_client("c0"))
+    calls = []
+
+    def client_model(client, market_state, available_freelancers, current_time):
+        calls.append(client.id)
+
+    engine.set_behavioral_models(client_model=client_model)
+    engine.run()
+
+    assert calls == ["c0", "c0"]
+    assert isinstance(engine.rng, np.random.Generator)
+
+
+def test_spawned_streams_are_independent_and_reproducible():
+    first = [rng.random() for rng in make_engine(random_seed=11).spawn_rngs(3)]
+    second = [rng.random() for rng in make_engine(random_seed=11).spawn_rngs(3)]
+
+    assert first == second
+    assert len(set(first)) == 3
+
+
+# Contract expiry
+
+def test_contracts_expire_the_day_after_their_end_date():
+    engine = make_engine(days=6)
+    engine.add_contract(make_contract("a", end_date=date(2024, 1, 3)))
+    engine.run()
+
+    assert engine.contracts["a"].status is ContractStatus.COMPLETED
+    # Snapshots are taken before contracts are processed, so the first day
+    # showing no active contract is the one after completion
+    assert list(engine.market_snapshots.column('active_contracts')) == [1, 1, 1, 1, 0, 0]
+
+
+@pytest.mark.parametrize("move", ["in_place", "helper"])
+def test_end_date_moved_earlier_expires_at_the_new_date(move):
+    engine = make_engine(days=8)
+    contract = make_contract("a", end_date=date(2024, 1, 7))
+    engine.add_contract(contract)
+
+    def shorten():
+        if move == "in_place":
+            contract.end_date = date(2024, 1, 2)
+        else:
+            engine.set_contract_end_date("a", date(2024, 1, 2))
+
+    engine.schedule(START, 1, shorten)
+    engine.run()
+
+    assert list(engine.market_snapshots.column('active_contracts')) == [1, 1, 1, 0, 0, 0, 0, 0]
+
+
+def test_end_date_moved_later_expires_at_the_new_date():
+    engine = make_engine(days=8)
+    contract = make_contract("a", end_date=date(2024, 1, 2))
+    engine.add_contract(contract)
+    engine.schedule(START, 1, lambda: setattr(contract, 'end_date', date(2024, 1, 5)))
+    engine.run()
+
+    assert list(engine.market_snapshots.column('active_contracts')) == [1, 1, 1, 1, 1, 1, 0, 0]
+
+
+def test_cleared_end_date_keeps_the_contract_active():
+    engine = make_engine(days=6)
+    contract = make_contract("a", end_date=date(2024, 1, 2))
+    engine.add_contract(contract)
+    engine.schedule(START, 1, lambda: engine.set_contract_end_date("a", None))
+    engine.run()
+
+    assert contract.status is ContractStatus.ACTIVE
+    assert list(engine.market_snapshots.column('active_contracts')) == [1] * 6
+
+
+def test_end_date_set_after_activation_is_scheduled():
+    engine = make_engine(days=6)
+    contract = make_contract("a", status=ContractStatus.DRAFT)
+    engine.add_contract(contract)
+
+    def activate():
+        contract.status = ContractStatus.ACTIVE
+        contract.end_date = date(2024, 1, 3)
+
+    engine.schedule(START, 1, activate)
+    engine.run()
+
+    assert contract.status is ContractStatus.COMPLETED
+    assert list(engine.market_snapshots.column('active_contracts')) == [0, 1, 1, 1, 0, 0]
@@ -0,0 +1,113 @@
+"""Tests for the columnar transaction ledger."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from core.entities import Transaction
+from core.transaction_store import TransactionStore
+
+
+def make_transaction(day: int, amount: str, **overrides) -> Transaction:
+    values = dict(
+        id=f"txn-{day}-{amount}",
+        contract_id="contract-1",
+        freelancer_id="freelancer-1",
+        client_id="client-1",
+        amount=Decimal(amount),
+        transaction_date=datetime(2024, 1, day),
+        payment_method="ach",
+        status="completed",
+    )
+    values.update(overrides)
+    return Transaction(**values)
+
+
+def test_rows_stay_sorted_when_transactions_arrive_out_of_order():
+    store = TransactionStore(capacity=2)
+    for day in (1, 5, 3, 5, 2):
+        store.add(make_transaction(day, "10.00"))
+
+    assert len(store) == 5
+    assert [t.transaction_date.day for t in store] == [1, 2, 3, 5, 5]
+    assert list(store.column('date_ordinal')) == sorted(store.column('date_ordinal'))
+
+
+def test_add_returns_sorted_position():
+    store = TransactionStore()
+    assert store.add(make_transaction(1, "1.00")) == 0
+    assert store.add(make_transaction(4, "1.00")) == 1
+    assert store.add(make_transaction(2, "1.00")) == 1
+
+
+def test_volume_windows_are_inclusive():
+    store = TransactionStore()
+    for day, amount in ((1, "10.00"), (2, "20.50"), (2, "4.50"), (4, "100.00")):
+        store.append(make_transaction(day, amount))
+
+    first = datetime(2024, 1, 1).toordinal()
+    assert store.volume_cents(first, first + 3) == 13500
+    assert store.volume_cents(first + 1, first + 2) == 2500
+    assert store.volume_cents(first + 2, first + 2) == 0
+    assert store.daily_volume(first + 3) == 10000
+
+
+def test_transactions_round_trip():
+    store = TransactionStore()
+    original = make_transaction(
+        3, "1234.56",
+        compliance_costs=Decimal("12.34"),
+        administrative_overhead=Decimal("0.99"),
+        dispute_costs=Decimal("5.00"),
+        description="milestone payment",
+        reference_number="REF-1",
+    )
+    store.add(original)
+
+    assert store[0] == original
+    assert store[-1] == original
+    assert store[0:1] == [original]
+
+
+def test_sub_cent_amounts_round_half_up():
+    store = TransactionStore()
+    store.add(make_transaction(1, "5.005"))
+
+    assert store[0].amount == Decimal("5.01")
+    assert store.column('amount')[0] == 501
+
+
+def test_update_status_changes_the_stored_row():
+    store = TransactionStore()
+    store.add(make_transaction(1, "10.00", status="pending"))
+
+    detached = store[0]
+    detached.status = "failed"
+    assert store[0].status == "pending"
+
+    store.update_status(0, "disputed")
+    assert store[0].status == "disputed"
+
+
+def test_index_out_of_range():
+    store = TransactionStore()
+    with pytest.raises(IndexError):
+        store[0]
+    with pytest.raises(IndexError):
+        store.update_status(0, "completed")
+
+
+def test_int_and_float_amounts_are_accepted():
+    whole = make_transaction(1, "0", compliance_costs=0.1)
+    whole.amount = 12
+    fractional = make_transaction(2, "0")
+    fractional.amount = 5.005
+
+    store = TransactionStore()
+    store.add(whole)
+    store.add(fractional)
+
+    assert store[0].amount == Decimal("12.00")
+    assert store[0].compliance_costs == Decimal("0.10")
+    assert store[1].amount == Decimal("5.01")